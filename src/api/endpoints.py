@@ -1,8 +1,21 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException, Request, Header, Depends
 from fastapi.responses import JSONResponse, StreamingResponse
+
+# 显式构造的错误/状态响应也走orjson，未安装时回退到JSONResponse
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as _JSONResponse
+except ImportError:
+    _JSONResponse = JSONResponse
 from datetime import datetime
+from functools import lru_cache
+import logging
+import time
+import traceback
 import uuid
-from typing import Optional
+from typing import Dict, Optional
 
 from src.core.config import config
 from src.core.logging import logger
@@ -14,6 +27,13 @@ from src.conversion.response_converter import (
     convert_openai_streaming_to_claude_with_cancellation,
 )
 from src.core.model_manager import model_manager
+from src.core.token_estimate import estimate_tokens
+
+# sse-starlette做SSE分帧并周期性发送keep-alive ping，缺少依赖时回退到StreamingResponse
+try:
+    from sse_starlette.sse import EventSourceResponse
+except ImportError:
+    EventSourceResponse = None
 
 router = APIRouter()
 
@@ -25,40 +45,88 @@ openai_client = OpenAIClient(
     api_version=config.azure_api_version,
 )
 
+# 已验证API密钥的TTL缓存，避免热路径上重复的字符串比较
+_API_KEY_CACHE_TTL = 300  # seconds
+_API_KEY_CACHE_SIZE = 1024
+_valid_key_cache: Dict[str, float] = {}
+_invalid_key_cache: Dict[str, float] = {}
+
+
+def _cache_lookup(cache: Dict[str, float], key: str) -> bool:
+    """Check a TTL cache for a key, evicting it if expired."""
+    expires = cache.get(key)
+    if expires is None:
+        return False
+    if expires < time.monotonic():
+        del cache[key]
+        return False
+    return True
+
+
+def _cache_store(cache: Dict[str, float], key: str) -> None:
+    """Store a key in a TTL cache, dropping stale entries when full."""
+    if len(cache) >= _API_KEY_CACHE_SIZE:
+        cache.clear()
+    cache[key] = time.monotonic() + _API_KEY_CACHE_TTL
+
+
 async def validate_api_key(x_api_key: Optional[str] = Header(None), authorization: Optional[str] = Header(None)):
     """Validate the client's API key from either x-api-key header or Authorization header."""
     client_api_key = None
-    
+
     # Extract API key from headers
     if x_api_key:
         client_api_key = x_api_key
     elif authorization and authorization.startswith("Bearer "):
         client_api_key = authorization.replace("Bearer ", "")
-    
+
     # Skip validation if ANTHROPIC_API_KEY is not set in the environment
     if not config.anthropic_api_key:
         return client_api_key
-        
+
+    # Fast path: recently validated (or rejected) keys skip the comparison
+    if client_api_key:
+        if _cache_lookup(_valid_key_cache, client_api_key):
+            return client_api_key
+        if _cache_lookup(_invalid_key_cache, client_api_key):
+            raise HTTPException(
+                status_code=401,
+                detail="Invalid API key. Please provide a valid Anthropic API key."
+            )
+
     # Validate the client API key for Anthropic validation
     if not client_api_key or not config.validate_client_api_key(client_api_key):
-        logger.warning(f"Invalid API key provided by client")
+        if client_api_key:
+            _cache_store(_invalid_key_cache, client_api_key)
+        logger.warning("Invalid API key provided by client")
         raise HTTPException(
             status_code=401,
             detail="Invalid API key. Please provide a valid Anthropic API key."
         )
-    
+
+    _cache_store(_valid_key_cache, client_api_key)
     return client_api_key
 
+@lru_cache(maxsize=256)
+def _build_client(api_key: str) -> OpenAIClient:
+    """Build (and memoize) an OpenAIClient for a client-supplied API key.
+
+    Reusing the client keeps its connection pool warm instead of paying
+    TLS and pool setup on every request from the same key.
+    """
+    return OpenAIClient(
+        api_key,
+        config.openai_base_url,
+        config.request_timeout,
+        api_version=config.azure_api_version,
+    )
+
+
 def get_openai_client(client_api_key: Optional[str] = None):
     """获取OpenAI客户端，优先使用客户端提供的API密钥，其次使用环境变量中的API密钥"""
     # 如果客户端提供了API密钥且以sk-开头（OpenAI密钥格式），则使用客户端的密钥
     if client_api_key and client_api_key.startswith("sk-"):
-        return OpenAIClient(
-            client_api_key,
-            config.openai_base_url,
-            config.request_timeout,
-            api_version=config.azure_api_version,
-        )
+        return _build_client(client_api_key)
     
     # 如果没有客户端提供的API密钥，但有环境变量中的API密钥
     if config.openai_api_key:
@@ -73,15 +141,27 @@ def get_openai_client(client_api_key: Optional[str] = None):
     
     return openai_client
 
+async def _watch_disconnect(http_request: Request, openai_client: OpenAIClient, request_id: str) -> None:
+    """Poll for client disconnect and cancel the upstream request when it happens.
+
+    The streaming path checks per chunk; this covers the non-streaming
+    call, which otherwise waits for the full completion.
+    """
+    while not await http_request.is_disconnected():
+        await asyncio.sleep(0.25)
+    openai_client.cancel_request(request_id)
+
+
 @router.post("/v1/messages")
 async def create_message(request: ClaudeMessagesRequest, http_request: Request, client_api_key: str = Depends(validate_api_key)):
     try:
         logger.debug(
-            f"Processing Claude request: model={request.model}, stream={request.stream}"
+            "Processing Claude request: model=%s, stream=%s", request.model, request.stream
         )
-        
+
         # 添加更详细的模型名称日志
-        logger.info(f"Client requested model: '{request.model}'")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Client requested model: '%s'", request.model)
 
         # 获取适当的OpenAI客户端
         current_openai_client = get_openai_client(client_api_key)
@@ -89,28 +169,40 @@ async def create_message(request: ClaudeMessagesRequest, http_request: Request,
         # Generate unique request ID for cancellation tracking
         request_id = str(uuid.uuid4())
 
-        # Convert Claude request to OpenAI format
-        openai_request = convert_claude_to_openai(request, model_manager)
-
-        # Check if client disconnected before processing
+        # Check if client disconnected before spending CPU on conversion
         if await http_request.is_disconnected():
             raise HTTPException(status_code=499, detail="Client disconnected")
 
+        # Convert Claude request to OpenAI format
+        openai_request = convert_claude_to_openai(request, model_manager)
+
         if request.stream:
             # Streaming response - wrap in error handling
             try:
                 openai_stream = current_openai_client.create_chat_completion_stream(
                     openai_request, request_id
                 )
+                claude_stream = convert_openai_streaming_to_claude_with_cancellation(
+                    openai_stream,
+                    request,
+                    logger,
+                    http_request,
+                    current_openai_client,
+                    request_id,
+                )
+                if EventSourceResponse is not None:
+                    # 事件已按SSE格式预编码为bytes，EventSourceResponse原样透传
+                    # 并每15秒发送keep-alive ping，防止中间代理断开长连接
+                    return EventSourceResponse(
+                        claude_stream,
+                        ping=15,
+                        headers={
+                            "Access-Control-Allow-Origin": "*",
+                            "Access-Control-Allow-Headers": "*",
+                        },
+                    )
                 return StreamingResponse(
-                    convert_openai_streaming_to_claude_with_cancellation(
-                        openai_stream,
-                        request,
-                        logger,
-                        http_request,
-                        current_openai_client,
-                        request_id,
-                    ),
+                    claude_stream,
                     media_type="text/event-stream",
                     headers={
                         "Cache-Control": "no-cache",
@@ -121,21 +213,25 @@ async def create_message(request: ClaudeMessagesRequest, http_request: Request,
                 )
             except HTTPException as e:
                 # Convert to proper error response for streaming
-                logger.error(f"Streaming error: {e.detail}")
-                import traceback
-
+                logger.error("Streaming error: %s", e.detail)
                 logger.error(traceback.format_exc())
                 error_message = current_openai_client.classify_openai_error(e.detail)
                 error_response = {
                     "type": "error",
                     "error": {"type": "api_error", "message": error_message},
                 }
-                return JSONResponse(status_code=e.status_code, content=error_response)
+                return _JSONResponse(status_code=e.status_code, content=error_response)
         else:
-            # Non-streaming response
-            openai_response = await current_openai_client.create_chat_completion(
-                openai_request, request_id
+            # Non-streaming response - watch for disconnects so the upstream call is cancelled
+            disconnect_task = asyncio.create_task(
+                _watch_disconnect(http_request, current_openai_client, request_id)
             )
+            try:
+                openai_response = await current_openai_client.create_chat_completion(
+                    openai_request, request_id
+                )
+            finally:
+                disconnect_task.cancel()
             claude_response = convert_openai_to_claude_response(
                 openai_response, request
             )
@@ -143,62 +239,81 @@ async def create_message(request: ClaudeMessagesRequest, http_request: Request,
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-
-        logger.error(f"Unexpected error processing request: {e}")
+        logger.error("Unexpected error processing request: %s", e)
         logger.error(traceback.format_exc())
         error_message = openai_client.classify_openai_error(str(e))
         raise HTTPException(status_code=500, detail=error_message)
 
 
+def _iter_texts(request: ClaudeTokenCountRequest):
+    """Yield every text fragment in the request (system prompt and message blocks).
+
+    Block types are discriminated with a single getattr-with-default per
+    block; no hasattr probing and no AttributeError handling on the miss
+    path.
+    """
+    if request.system:
+        if isinstance(request.system, str):
+            yield request.system
+        else:
+            for block in request.system:
+                if (text := getattr(block, "text", None)) is not None:
+                    yield text
+
+    for msg in request.messages:
+        content = msg.content
+        if content is None:
+            continue
+        if isinstance(content, str):
+            yield content
+        else:
+            for block in content:
+                if (text := getattr(block, "text", None)) is not None:
+                    yield text
+
+
 @router.post("/v1/messages/count_tokens")
 async def count_tokens(request: ClaudeTokenCountRequest, client_api_key: str = Depends(validate_api_key)):
     try:
         # For token counting, we'll use a simple estimation
         # In a real implementation, you might want to use tiktoken or similar
-
-        total_chars = 0
-
-        # Count system message characters
-        if request.system:
-            if isinstance(request.system, str):
-                total_chars += len(request.system)
-            elif isinstance(request.system, list):
-                for block in request.system:
-                    if hasattr(block, "text"):
-                        total_chars += len(block.text)
-
-        # Count message characters
-        for msg in request.messages:
-            if msg.content is None:
-                continue
-            elif isinstance(msg.content, str):
-                total_chars += len(msg.content)
-            elif isinstance(msg.content, list):
-                for block in msg.content:
-                    if hasattr(block, "text") and block.text is not None:
-                        total_chars += len(block.text)
-
-        # Rough estimation: 4 characters per token
-        estimated_tokens = max(1, total_chars // 4)
+        estimated_tokens = estimate_tokens(tuple(_iter_texts(request)))
 
         return {"input_tokens": estimated_tokens}
 
     except Exception as e:
-        logger.error(f"Error counting tokens: {e}")
+        logger.error("Error counting tokens: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# /health被监控探针高频访问，时间戳按秒缓存即可
+_now_iso_cache = ("", 0.0)
+
+
+def _now_iso() -> str:
+    """Return the current ISO timestamp, memoized for one second."""
+    global _now_iso_cache
+    value, expires = _now_iso_cache
+    now = time.monotonic()
+    if now >= expires:
+        value = datetime.now().isoformat()
+        _now_iso_cache = (value, now + 1.0)
+    return value
+
+
+# 配置启动后不变，/health和/的静态部分在导入时构建一次
+_HEALTH_BASE = {
+    "status": "healthy",
+    "openai_api_configured": bool(config.openai_api_key),
+    "api_key_valid": config.validate_api_key() if config.openai_api_key else False,
+    "client_api_key_validation": bool(config.anthropic_api_key),
+}
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "openai_api_configured": bool(config.openai_api_key),
-        "api_key_valid": config.validate_api_key() if config.openai_api_key else False,
-        "client_api_key_validation": bool(config.anthropic_api_key),
-    }
+    return {**_HEALTH_BASE, "timestamp": _now_iso()}
 
 
 @router.get("/test-connection")
@@ -226,8 +341,8 @@ async def test_connection(client_api_key: Optional[str] = Depends(validate_api_k
         }
 
     except Exception as e:
-        logger.error(f"API connectivity test failed: {e}")
-        return JSONResponse(
+        logger.error("API connectivity test failed: %s", e)
+        return _JSONResponse(
             status_code=503,
             content={
                 "status": "failed",
@@ -243,24 +358,27 @@ async def test_connection(client_api_key: Optional[str] = Depends(validate_api_k
         )
 
 
+_ROOT_BODY = {
+    "message": "Claude-to-OpenAI API Proxy v1.0.0",
+    "status": "running",
+    "config": {
+        "openai_base_url": config.openai_base_url,
+        "max_tokens_limit": config.max_tokens_limit,
+        "api_key_configured": bool(config.openai_api_key),
+        "client_api_key_validation": bool(config.anthropic_api_key),
+        "big_model": config.big_model,
+        "small_model": config.small_model,
+    },
+    "endpoints": {
+        "messages": "/v1/messages",
+        "count_tokens": "/v1/messages/count_tokens",
+        "health": "/health",
+        "test_connection": "/test-connection",
+    },
+}
+
+
 @router.get("/")
 async def root():
     """Root endpoint"""
-    return {
-        "message": "Claude-to-OpenAI API Proxy v1.0.0",
-        "status": "running",
-        "config": {
-            "openai_base_url": config.openai_base_url,
-            "max_tokens_limit": config.max_tokens_limit,
-            "api_key_configured": bool(config.openai_api_key),
-            "client_api_key_validation": bool(config.anthropic_api_key),
-            "big_model": config.big_model,
-            "small_model": config.small_model,
-        },
-        "endpoints": {
-            "messages": "/v1/messages",
-            "count_tokens": "/v1/messages/count_tokens",
-            "health": "/health",
-            "test_connection": "/test-connection",
-        },
-    }
+    return _ROOT_BODY
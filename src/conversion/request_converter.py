@@ -1,12 +1,12 @@
 import json
 from typing import Dict, Any, List
-from venv import logger
 from src.core.constants import Constants
+from src.core.logging import get_logger
 from src.models.claude import ClaudeMessagesRequest, ClaudeMessage
 from src.core.config import config
 import logging
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 def convert_claude_to_openai(
@@ -15,9 +15,9 @@ def convert_claude_to_openai(
     """Convert Claude API request format to OpenAI format."""
 
     # Map model
-    logger.info(f"Converting model: from Claude model '{claude_request.model}' to OpenAI format")
+    logger.info("Converting model: from Claude model '%s' to OpenAI format", claude_request.model)
     openai_model = model_manager.map_claude_model_to_openai(claude_request.model)
-    logger.info(f"Model mapping result: Claude '{claude_request.model}' -> OpenAI '{openai_model}'")
+    logger.info("Model mapping result: Claude '%s' -> OpenAI '%s'", claude_request.model, openai_model)
 
     # Convert messages
     openai_messages = []
@@ -96,9 +96,11 @@ def convert_claude_to_openai(
         
     openai_request["max_tokens"] = max_tokens
     
-    logger.debug(
-        f"Converted Claude request to OpenAI format: {json.dumps(openai_request, indent=2, ensure_ascii=False)}"
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Converted Claude request to OpenAI format: %s",
+            json.dumps(openai_request, indent=2, ensure_ascii=False),
+        )
     # Add optional parameters
     if claude_request.stop_sequences:
         openai_request["stop"] = claude_request.stop_sequences
@@ -1,10 +1,22 @@
 import json
+import traceback
 import uuid
+from typing import AsyncGenerator
 from fastapi import HTTPException, Request
 from src.core.constants import Constants
 from src.models.claude import ClaudeMessagesRequest
 
 
+def _sse_event(event_type: str, payload: dict) -> bytes:
+    """Serialize one SSE frame to bytes in a single pass.
+
+    Yielding bytes lets Starlette (and sse-starlette) forward the chunk
+    as-is instead of re-encoding a str per frame.
+    """
+    data = json.dumps(payload, ensure_ascii=False)
+    return f"event: {event_type}\ndata: {data}\n\n".encode("utf-8")
+
+
 def convert_openai_to_claude_response(
     openai_response: dict, original_request: ClaudeMessagesRequest
 ) -> dict:
@@ -80,17 +92,21 @@ def convert_openai_to_claude_response(
 
 async def convert_openai_streaming_to_claude(
     openai_stream, original_request: ClaudeMessagesRequest, logger
-):
-    """Convert OpenAI streaming response to Claude streaming format."""
+) -> AsyncGenerator[bytes, None]:
+    """Convert OpenAI streaming response to Claude streaming format.
+
+    Must stay an async generator: Starlette offloads sync iterators to a
+    threadpool, which adds a context switch per SSE chunk.
+    """
 
     message_id = f"msg_{uuid.uuid4().hex[:24]}"
 
     # Send initial SSE events
-    yield f"event: {Constants.EVENT_MESSAGE_START}\ndata: {json.dumps({'type': Constants.EVENT_MESSAGE_START, 'message': {'id': message_id, 'type': 'message', 'role': Constants.ROLE_ASSISTANT, 'model': original_request.model, 'content': [], 'stop_reason': None, 'stop_sequence': None, 'usage': {'input_tokens': 0, 'output_tokens': 0}}}, ensure_ascii=False)}\n\n"
+    yield _sse_event(Constants.EVENT_MESSAGE_START, {'type': Constants.EVENT_MESSAGE_START, 'message': {'id': message_id, 'type': 'message', 'role': Constants.ROLE_ASSISTANT, 'model': original_request.model, 'content': [], 'stop_reason': None, 'stop_sequence': None, 'usage': {'input_tokens': 0, 'output_tokens': 0}}})
 
-    yield f"event: {Constants.EVENT_CONTENT_BLOCK_START}\ndata: {json.dumps({'type': Constants.EVENT_CONTENT_BLOCK_START, 'index': 0, 'content_block': {'type': Constants.CONTENT_TEXT, 'text': ''}}, ensure_ascii=False)}\n\n"
+    yield _sse_event(Constants.EVENT_CONTENT_BLOCK_START, {'type': Constants.EVENT_CONTENT_BLOCK_START, 'index': 0, 'content_block': {'type': Constants.CONTENT_TEXT, 'text': ''}})
 
-    yield f"event: {Constants.EVENT_PING}\ndata: {json.dumps({'type': Constants.EVENT_PING}, ensure_ascii=False)}\n\n"
+    yield _sse_event(Constants.EVENT_PING, {'type': Constants.EVENT_PING})
 
     # Process streaming chunks
     text_block_index = 0
@@ -113,7 +129,7 @@ async def convert_openai_streaming_to_claude(
                             continue
                     except json.JSONDecodeError as e:
                         logger.warning(
-                            f"Failed to parse chunk: {chunk_data}, error: {e}"
+                            "Failed to parse chunk: %s, error: %s", chunk_data, e
                         )
                         continue
 
@@ -123,7 +139,7 @@ async def convert_openai_streaming_to_claude(
 
                     # Handle text delta
                     if delta and "content" in delta and delta["content"] is not None:
-                        yield f"event: {Constants.EVENT_CONTENT_BLOCK_DELTA}\ndata: {json.dumps({'type': Constants.EVENT_CONTENT_BLOCK_DELTA, 'index': text_block_index, 'delta': {'type': Constants.DELTA_TEXT, 'text': delta['content']}}, ensure_ascii=False)}\n\n"
+                        yield _sse_event(Constants.EVENT_CONTENT_BLOCK_DELTA, {'type': Constants.EVENT_CONTENT_BLOCK_DELTA, 'index': text_block_index, 'delta': {'type': Constants.DELTA_TEXT, 'text': delta['content']}})
 
                     # Handle tool call deltas with improved incremental processing
                     if "tool_calls" in delta:
@@ -159,7 +175,7 @@ async def convert_openai_streaming_to_claude(
                                 tool_call["claude_index"] = claude_index
                                 tool_call["started"] = True
                                 
-                                yield f"event: {Constants.EVENT_CONTENT_BLOCK_START}\ndata: {json.dumps({'type': Constants.EVENT_CONTENT_BLOCK_START, 'index': claude_index, 'content_block': {'type': Constants.CONTENT_TOOL_USE, 'id': tool_call['id'], 'name': tool_call['name'], 'input': {}}}, ensure_ascii=False)}\n\n"
+                                yield _sse_event(Constants.EVENT_CONTENT_BLOCK_START, {'type': Constants.EVENT_CONTENT_BLOCK_START, 'index': claude_index, 'content_block': {'type': Constants.CONTENT_TOOL_USE, 'id': tool_call['id'], 'name': tool_call['name'], 'input': {}}})
                             
                             # Handle function arguments
                             if "arguments" in function_data and tool_call["started"] and function_data["arguments"] is not None:
@@ -170,7 +186,7 @@ async def convert_openai_streaming_to_claude(
                                     json.loads(tool_call["args_buffer"])
                                     # If parsing succeeds and we haven't sent this JSON yet
                                     if not tool_call["json_sent"]:
-                                        yield f"event: {Constants.EVENT_CONTENT_BLOCK_DELTA}\ndata: {json.dumps({'type': Constants.EVENT_CONTENT_BLOCK_DELTA, 'index': tool_call['claude_index'], 'delta': {'type': Constants.DELTA_INPUT_JSON, 'partial_json': tool_call['args_buffer']}}, ensure_ascii=False)}\n\n"
+                                        yield _sse_event(Constants.EVENT_CONTENT_BLOCK_DELTA, {'type': Constants.EVENT_CONTENT_BLOCK_DELTA, 'index': tool_call['claude_index'], 'delta': {'type': Constants.DELTA_INPUT_JSON, 'partial_json': tool_call['args_buffer']}})
                                         tool_call["json_sent"] = True
                                 except json.JSONDecodeError:
                                     # JSON is incomplete, continue accumulating
@@ -190,27 +206,25 @@ async def convert_openai_streaming_to_claude(
 
     except Exception as e:
         # Handle any streaming errors gracefully
-        logger.error(f"Streaming error: {e}")
-        import traceback
-
+        logger.error("Streaming error: %s", e)
         logger.error(traceback.format_exc())
         error_event = {
             "type": "error",
             "error": {"type": "api_error", "message": f"Streaming error: {str(e)}"},
         }
-        yield f"event: error\ndata: {json.dumps(error_event, ensure_ascii=False)}\n\n"
+        yield _sse_event("error", error_event)
         return
 
     # Send final SSE events
-    yield f"event: {Constants.EVENT_CONTENT_BLOCK_STOP}\ndata: {json.dumps({'type': Constants.EVENT_CONTENT_BLOCK_STOP, 'index': text_block_index}, ensure_ascii=False)}\n\n"
+    yield _sse_event(Constants.EVENT_CONTENT_BLOCK_STOP, {'type': Constants.EVENT_CONTENT_BLOCK_STOP, 'index': text_block_index})
 
     for tool_data in current_tool_calls.values():
         if tool_data.get("started") and tool_data.get("claude_index") is not None:
-            yield f"event: {Constants.EVENT_CONTENT_BLOCK_STOP}\ndata: {json.dumps({'type': Constants.EVENT_CONTENT_BLOCK_STOP, 'index': tool_data['claude_index']}, ensure_ascii=False)}\n\n"
+            yield _sse_event(Constants.EVENT_CONTENT_BLOCK_STOP, {'type': Constants.EVENT_CONTENT_BLOCK_STOP, 'index': tool_data['claude_index']})
 
     usage_data = {"input_tokens": 0, "output_tokens": 0}
-    yield f"event: {Constants.EVENT_MESSAGE_DELTA}\ndata: {json.dumps({'type': Constants.EVENT_MESSAGE_DELTA, 'delta': {'stop_reason': final_stop_reason, 'stop_sequence': None}, 'usage': usage_data}, ensure_ascii=False)}\n\n"
-    yield f"event: {Constants.EVENT_MESSAGE_STOP}\ndata: {json.dumps({'type': Constants.EVENT_MESSAGE_STOP}, ensure_ascii=False)}\n\n"
+    yield _sse_event(Constants.EVENT_MESSAGE_DELTA, {'type': Constants.EVENT_MESSAGE_DELTA, 'delta': {'stop_reason': final_stop_reason, 'stop_sequence': None}, 'usage': usage_data})
+    yield _sse_event(Constants.EVENT_MESSAGE_STOP, {'type': Constants.EVENT_MESSAGE_STOP})
 
 
 async def convert_openai_streaming_to_claude_with_cancellation(
@@ -220,17 +234,21 @@ async def convert_openai_streaming_to_claude_with_cancellation(
     http_request: Request,
     openai_client,
     request_id: str,
-):
-    """Convert OpenAI streaming response to Claude streaming format with cancellation support."""
+) -> AsyncGenerator[bytes, None]:
+    """Convert OpenAI streaming response to Claude streaming format with cancellation support.
+
+    Must stay an async generator: Starlette offloads sync iterators to a
+    threadpool, which adds a context switch per SSE chunk.
+    """
 
     message_id = f"msg_{uuid.uuid4().hex[:24]}"
 
     # Send initial SSE events
-    yield f"event: {Constants.EVENT_MESSAGE_START}\ndata: {json.dumps({'type': Constants.EVENT_MESSAGE_START, 'message': {'id': message_id, 'type': 'message', 'role': Constants.ROLE_ASSISTANT, 'model': original_request.model, 'content': [], 'stop_reason': None, 'stop_sequence': None, 'usage': {'input_tokens': 0, 'output_tokens': 0}}}, ensure_ascii=False)}\n\n"
+    yield _sse_event(Constants.EVENT_MESSAGE_START, {'type': Constants.EVENT_MESSAGE_START, 'message': {'id': message_id, 'type': 'message', 'role': Constants.ROLE_ASSISTANT, 'model': original_request.model, 'content': [], 'stop_reason': None, 'stop_sequence': None, 'usage': {'input_tokens': 0, 'output_tokens': 0}}})
 
-    yield f"event: {Constants.EVENT_CONTENT_BLOCK_START}\ndata: {json.dumps({'type': Constants.EVENT_CONTENT_BLOCK_START, 'index': 0, 'content_block': {'type': Constants.CONTENT_TEXT, 'text': ''}}, ensure_ascii=False)}\n\n"
+    yield _sse_event(Constants.EVENT_CONTENT_BLOCK_START, {'type': Constants.EVENT_CONTENT_BLOCK_START, 'index': 0, 'content_block': {'type': Constants.CONTENT_TEXT, 'text': ''}})
 
-    yield f"event: {Constants.EVENT_PING}\ndata: {json.dumps({'type': Constants.EVENT_PING}, ensure_ascii=False)}\n\n"
+    yield _sse_event(Constants.EVENT_PING, {'type': Constants.EVENT_PING})
 
     # Process streaming chunks
     text_block_index = 0
@@ -243,7 +261,7 @@ async def convert_openai_streaming_to_claude_with_cancellation(
         async for line in openai_stream:
             # Check if client disconnected
             if await http_request.is_disconnected():
-                logger.info(f"Client disconnected, cancelling request {request_id}")
+                logger.info("Client disconnected, cancelling request %s", request_id)
                 openai_client.cancel_request(request_id)
                 break
 
@@ -272,7 +290,7 @@ async def convert_openai_streaming_to_claude_with_cancellation(
                             continue
                     except json.JSONDecodeError as e:
                         logger.warning(
-                            f"Failed to parse chunk: {chunk_data}, error: {e}"
+                            "Failed to parse chunk: %s, error: %s", chunk_data, e
                         )
                         continue
 
@@ -282,7 +300,7 @@ async def convert_openai_streaming_to_claude_with_cancellation(
 
                     # Handle text delta
                     if delta and "content" in delta and delta["content"] is not None:
-                        yield f"event: {Constants.EVENT_CONTENT_BLOCK_DELTA}\ndata: {json.dumps({'type': Constants.EVENT_CONTENT_BLOCK_DELTA, 'index': text_block_index, 'delta': {'type': Constants.DELTA_TEXT, 'text': delta['content']}}, ensure_ascii=False)}\n\n"
+                        yield _sse_event(Constants.EVENT_CONTENT_BLOCK_DELTA, {'type': Constants.EVENT_CONTENT_BLOCK_DELTA, 'index': text_block_index, 'delta': {'type': Constants.DELTA_TEXT, 'text': delta['content']}})
 
                     # Handle tool call deltas with improved incremental processing
                     if "tool_calls" in delta and delta["tool_calls"]:
@@ -318,7 +336,7 @@ async def convert_openai_streaming_to_claude_with_cancellation(
                                 tool_call["claude_index"] = claude_index
                                 tool_call["started"] = True
                                 
-                                yield f"event: {Constants.EVENT_CONTENT_BLOCK_START}\ndata: {json.dumps({'type': Constants.EVENT_CONTENT_BLOCK_START, 'index': claude_index, 'content_block': {'type': Constants.CONTENT_TOOL_USE, 'id': tool_call['id'], 'name': tool_call['name'], 'input': {}}}, ensure_ascii=False)}\n\n"
+                                yield _sse_event(Constants.EVENT_CONTENT_BLOCK_START, {'type': Constants.EVENT_CONTENT_BLOCK_START, 'index': claude_index, 'content_block': {'type': Constants.CONTENT_TOOL_USE, 'id': tool_call['id'], 'name': tool_call['name'], 'input': {}}})
                             
                             # Handle function arguments
                             if "arguments" in function_data and tool_call["started"] and function_data["arguments"] is not None:
@@ -329,7 +347,7 @@ async def convert_openai_streaming_to_claude_with_cancellation(
                                     json.loads(tool_call["args_buffer"])
                                     # If parsing succeeds and we haven't sent this JSON yet
                                     if not tool_call["json_sent"]:
-                                        yield f"event: {Constants.EVENT_CONTENT_BLOCK_DELTA}\ndata: {json.dumps({'type': Constants.EVENT_CONTENT_BLOCK_DELTA, 'index': tool_call['claude_index'], 'delta': {'type': Constants.DELTA_INPUT_JSON, 'partial_json': tool_call['args_buffer']}}, ensure_ascii=False)}\n\n"
+                                        yield _sse_event(Constants.EVENT_CONTENT_BLOCK_DELTA, {'type': Constants.EVENT_CONTENT_BLOCK_DELTA, 'index': tool_call['claude_index'], 'delta': {'type': Constants.DELTA_INPUT_JSON, 'partial_json': tool_call['args_buffer']}})
                                         tool_call["json_sent"] = True
                                 except json.JSONDecodeError:
                                     # JSON is incomplete, continue accumulating
@@ -349,7 +367,7 @@ async def convert_openai_streaming_to_claude_with_cancellation(
     except HTTPException as e:
         # Handle cancellation
         if e.status_code == 499:
-            logger.info(f"Request {request_id} was cancelled")
+            logger.info("Request %s was cancelled", request_id)
             error_event = {
                 "type": "error",
                 "error": {
@@ -357,29 +375,27 @@ async def convert_openai_streaming_to_claude_with_cancellation(
                     "message": "Request was cancelled by client",
                 },
             }
-            yield f"event: error\ndata: {json.dumps(error_event, ensure_ascii=False)}\n\n"
+            yield _sse_event("error", error_event)
             return
         else:
             raise
     except Exception as e:
         # Handle any streaming errors gracefully
-        logger.error(f"Streaming error: {e}")
-        import traceback
-
+        logger.error("Streaming error: %s", e)
         logger.error(traceback.format_exc())
         error_event = {
             "type": "error",
             "error": {"type": "api_error", "message": f"Streaming error: {str(e)}"},
         }
-        yield f"event: error\ndata: {json.dumps(error_event, ensure_ascii=False)}\n\n"
+        yield _sse_event("error", error_event)
         return
 
     # Send final SSE events
-    yield f"event: {Constants.EVENT_CONTENT_BLOCK_STOP}\ndata: {json.dumps({'type': Constants.EVENT_CONTENT_BLOCK_STOP, 'index': text_block_index}, ensure_ascii=False)}\n\n"
+    yield _sse_event(Constants.EVENT_CONTENT_BLOCK_STOP, {'type': Constants.EVENT_CONTENT_BLOCK_STOP, 'index': text_block_index})
 
     for tool_data in current_tool_calls.values():
         if tool_data.get("started") and tool_data.get("claude_index") is not None:
-            yield f"event: {Constants.EVENT_CONTENT_BLOCK_STOP}\ndata: {json.dumps({'type': Constants.EVENT_CONTENT_BLOCK_STOP, 'index': tool_data['claude_index']}, ensure_ascii=False)}\n\n"
+            yield _sse_event(Constants.EVENT_CONTENT_BLOCK_STOP, {'type': Constants.EVENT_CONTENT_BLOCK_STOP, 'index': tool_data['claude_index']})
 
-    yield f"event: {Constants.EVENT_MESSAGE_DELTA}\ndata: {json.dumps({'type': Constants.EVENT_MESSAGE_DELTA, 'delta': {'stop_reason': final_stop_reason, 'stop_sequence': None}, 'usage': usage_data}, ensure_ascii=False)}\n\n"
-    yield f"event: {Constants.EVENT_MESSAGE_STOP}\ndata: {json.dumps({'type': Constants.EVENT_MESSAGE_STOP}, ensure_ascii=False)}\n\n"
+    yield _sse_event(Constants.EVENT_MESSAGE_DELTA, {'type': Constants.EVENT_MESSAGE_DELTA, 'delta': {'stop_reason': final_stop_reason, 'stop_sequence': None}, 'usage': usage_data})
+    yield _sse_event(Constants.EVENT_MESSAGE_STOP, {'type': Constants.EVENT_MESSAGE_STOP})
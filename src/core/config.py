@@ -1,59 +1,82 @@
+import hmac
 import os
 import sys
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 # Configuration
 class Config:
+    # __slots__把属性访问变成C层偏移查找，热路径上比__dict__查找更快
+    __slots__ = (
+        "openai_api_key",
+        "anthropic_api_key",
+        "openai_base_url",
+        "azure_api_version",
+        "host",
+        "port",
+        "log_level",
+        "max_tokens_limit",
+        "min_tokens_limit",
+        "request_timeout",
+        "max_retries",
+        "big_model",
+        "middle_model",
+        "small_model",
+    )
+
     def __init__(self):
-        self.openai_api_key = self._get_env_value("OPENAI_API_KEY")
+        # 一次性快照环境变量，后续读取都是纯dict查找，配置结果也可复现
+        env = dict(os.environ)
+
+        self.openai_api_key = self._get_env_value(env, "OPENAI_API_KEY")
         if not self.openai_api_key:
             print("Warning: OPENAI_API_KEY not set. Client API key will be required.")
         
         # Add Anthropic API key for client validation
-        self.anthropic_api_key = self._get_env_value("ANTHROPIC_API_KEY")
+        self.anthropic_api_key = self._get_env_value(env, "ANTHROPIC_API_KEY")
         if not self.anthropic_api_key:
             print("Warning: ANTHROPIC_API_KEY not set. Client API key validation will be disabled.")
         
-        self.openai_base_url = self._get_env_value("OPENAI_BASE_URL", "https://api.openai.com/v1")
-        self.azure_api_version = self._get_env_value("AZURE_API_VERSION")  # For Azure OpenAI
-        self.host = self._get_env_value("HOST", "0.0.0.0")
+        self.openai_base_url = self._get_env_value(env, "OPENAI_BASE_URL", "https://api.openai.com/v1")
+        self.azure_api_version = self._get_env_value(env, "AZURE_API_VERSION")  # For Azure OpenAI
+        self.host = self._get_env_value(env, "HOST", "0.0.0.0")
         
         # 安全地转换整数值，处理空字符串的情况
-        port_str = self._get_env_value("PORT")
+        port_str = self._get_env_value(env, "PORT")
         self.port = self._safe_int_convert(port_str, 8082)
         
-        self.log_level = self._get_env_value("LOG_LEVEL", "INFO")
+        self.log_level = self._get_env_value(env, "LOG_LEVEL", "INFO")
         
         # Token limits - if not set, no limits will be applied
-        if "MAX_TOKENS_LIMIT" in os.environ and os.environ["MAX_TOKENS_LIMIT"].strip():
-            max_tokens_str = os.environ["MAX_TOKENS_LIMIT"]
+        if "MAX_TOKENS_LIMIT" in env and env["MAX_TOKENS_LIMIT"].strip():
+            max_tokens_str = env["MAX_TOKENS_LIMIT"]
             self.max_tokens_limit = self._safe_int_convert(max_tokens_str, None)
         else:
             self.max_tokens_limit = None  # No limit
             
-        if "MIN_TOKENS_LIMIT" in os.environ and os.environ["MIN_TOKENS_LIMIT"].strip():
-            min_tokens_str = os.environ["MIN_TOKENS_LIMIT"]
+        if "MIN_TOKENS_LIMIT" in env and env["MIN_TOKENS_LIMIT"].strip():
+            min_tokens_str = env["MIN_TOKENS_LIMIT"]
             self.min_tokens_limit = self._safe_int_convert(min_tokens_str, None)
         else:
             self.min_tokens_limit = None  # No limit
         
         # Connection settings
-        timeout_str = self._get_env_value("REQUEST_TIMEOUT")
+        timeout_str = self._get_env_value(env, "REQUEST_TIMEOUT")
         self.request_timeout = self._safe_int_convert(timeout_str, 300)
         
-        retries_str = self._get_env_value("MAX_RETRIES")
+        retries_str = self._get_env_value(env, "MAX_RETRIES")
         self.max_retries = self._safe_int_convert(retries_str, 1)
         
         # 模型设置 - 如果未设置环境变量或为空，则设为None表示直接透传客户端模型
-        self.big_model = self._get_env_value("BIG_MODEL")
-        self.middle_model = self._get_env_value("MIDDLE_MODEL", self.big_model)
-        self.small_model = self._get_env_value("SMALL_MODEL")
+        self.big_model = self._get_env_value(env, "BIG_MODEL")
+        self.middle_model = self._get_env_value(env, "MIDDLE_MODEL", self.big_model)
+        self.small_model = self._get_env_value(env, "SMALL_MODEL")
     
-    def _get_env_value(self, env_name, default_value=None):
-        """获取环境变量值，空字符串视为未设置"""
-        value = os.environ.get(env_name, default_value)
+    def _get_env_value(self, env, env_name, default_value=None):
+        """从环境变量快照中取值，空字符串视为未设置"""
+        value = env.get(env_name, default_value)
         if value is not None and isinstance(value, str) and value.strip() == "":
             return default_value
         return value
@@ -83,32 +106,41 @@ class Config:
         if not self.anthropic_api_key:
             return True
             
-        # Check if the client's API key matches the expected value
-        return client_api_key == self.anthropic_api_key
+        # Check if the client's API key matches the expected value (constant-time)
+        # 比较bytes而不是str：compare_digest对含非ASCII字符的str会抛TypeError
+        return hmac.compare_digest(
+            client_api_key.encode("utf-8"), self.anthropic_api_key.encode("utf-8")
+        )
 
-try:
-    config = Config()
-    if config.openai_api_key:
-        print(f" Configuration loaded: API_KEY={'*' * 20}..., BASE_URL='{config.openai_base_url}'")
-    else:
-        print(f" Configuration loaded without OpenAI API key. BASE_URL='{config.openai_base_url}'")
-    
-    # 显示token限制配置信息
-    if config.max_tokens_limit is None:
-        print(f" Max Tokens: No limit")
-    else:
-        print(f" Max Tokens: {config.max_tokens_limit}")
-        
-    if config.min_tokens_limit is None:
-        print(f" Min Tokens: No limit")
-    else:
-        print(f" Min Tokens: {config.min_tokens_limit}")
-    
-    # 显示模型配置信息
-    print(f" Big Model (opus): {config.big_model if config.big_model else 'Passthrough client model'}")
-    print(f" Middle Model (sonnet): {config.middle_model if config.middle_model else 'Passthrough client model'}")
-    print(f" Small Model (haiku): {config.small_model if config.small_model else 'Passthrough client model'}")
-        
-except Exception as e:
-    print(f"=4 Configuration Error: {e}")
-    sys.exit(1)
+@lru_cache(maxsize=1)
+def get_config():
+    """Build the singleton Config, parsing the environment exactly once."""
+    try:
+        config = Config()
+        if config.openai_api_key:
+            print(f" Configuration loaded: API_KEY={'*' * 20}..., BASE_URL='{config.openai_base_url}'")
+        else:
+            print(f" Configuration loaded without OpenAI API key. BASE_URL='{config.openai_base_url}'")
+
+        # 显示token限制配置信息
+        if config.max_tokens_limit is None:
+            print(f" Max Tokens: No limit")
+        else:
+            print(f" Max Tokens: {config.max_tokens_limit}")
+
+        if config.min_tokens_limit is None:
+            print(f" Min Tokens: No limit")
+        else:
+            print(f" Min Tokens: {config.min_tokens_limit}")
+
+        # 显示模型配置信息
+        print(f" Big Model (opus): {config.big_model if config.big_model else 'Passthrough client model'}")
+        print(f" Middle Model (sonnet): {config.middle_model if config.middle_model else 'Passthrough client model'}")
+        print(f" Small Model (haiku): {config.small_model if config.small_model else 'Passthrough client model'}")
+        return config
+    except Exception as e:
+        print(f"=4 Configuration Error: {e}")
+        sys.exit(1)
+
+
+config = get_config()
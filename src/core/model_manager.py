@@ -1,7 +1,14 @@
 from src.core.config import config
+from src.core.logging import get_logger
 import logging
+import re
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+
+# 直接透传的模型前缀（OpenAI及ARK/Doubao/DeepSeek），startswith接受元组时在C层一次完成匹配
+_PASSTHROUGH_PREFIXES = ("gpt-", "o1-", "ep-", "doubao-", "deepseek-")
+# 预编译档位分类正则，每个请求只需一次扫描而不是多次in判断
+_CLASS_RE = re.compile(r"(haiku|sonnet|opus)", re.IGNORECASE)
 
 class ModelManager:
     def __init__(self, config):
@@ -9,6 +16,15 @@ class ModelManager:
         # 默认模型配置，当客户端模型名称为空时使用
         self.default_model = "gpt-4o"
         self.default_small_model = "gpt-4o-mini"
+        # 配置启动后不变，提前把各档位解析为有效模型名（未配置或空白则为None）
+        self._resolved_models = {
+            bucket: (value.strip() if value and value.strip() else None)
+            for bucket, value in (
+                ("haiku", config.small_model),
+                ("sonnet", config.middle_model),
+                ("opus", config.big_model),
+            )
+        }
     
     def map_claude_model_to_openai(self, claude_model: str) -> str:
         """Map Claude model names to OpenAI model names based on BIG/SMALL pattern"""
@@ -18,47 +34,20 @@ class ModelManager:
             # 如果配置了big_model，使用配置的大模型，否则使用默认模型
             return self.config.big_model or self.default_model
             
-        # If it's already an OpenAI model, return as-is
-        if claude_model.startswith("gpt-") or claude_model.startswith("o1-"):
+        # If it's already an OpenAI or other supported model (ARK/Doubao/DeepSeek), return as-is
+        if claude_model.startswith(_PASSTHROUGH_PREFIXES):
             return claude_model
 
-        # If it's other supported models (ARK/Doubao/DeepSeek), return as-is
-        if (claude_model.startswith("ep-") or claude_model.startswith("doubao-") or 
-            claude_model.startswith("deepseek-")):
+        # Map based on model naming patterns - one regex scan instead of substring checks
+        match = _CLASS_RE.search(claude_model)
+        bucket = match.group(1).lower() if match else "opus"
+
+        # 如果对应档位未配置模型，直接使用客户端模型名称
+        configured_model = self._resolved_models[bucket]
+        if configured_model is None:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("No %s tier model configured, using client model: %s", bucket, claude_model)
             return claude_model
-        
-        # Map based on model naming patterns
-        model_lower = claude_model.lower()
-        
-        # 使用haiku模型
-        if 'haiku' in model_lower:
-            # 如果没有配置small_model，直接使用客户端模型名称
-            if self.config.small_model is None or self.config.small_model.strip() == "":
-                logger.info(f"No small_model configured, using client model: {claude_model}")
-                return claude_model
-            return self.config.small_model
-            
-        # 使用sonnet模型
-        elif 'sonnet' in model_lower:
-            # 如果没有配置middle_model，直接使用客户端模型名称
-            if self.config.middle_model is None or self.config.middle_model.strip() == "":
-                logger.info(f"No middle_model configured, using client model: {claude_model}")
-                return claude_model
-            return self.config.middle_model
-            
-        # 使用opus模型
-        elif 'opus' in model_lower:
-            # 如果没有配置big_model，直接使用客户端模型名称
-            if self.config.big_model is None or self.config.big_model.strip() == "":
-                logger.info(f"No big_model configured, using client model: {claude_model}")
-                return claude_model
-            return self.config.big_model
-            
-        else:
-            # 默认使用big_model，如果没有配置，则直接使用客户端模型名称
-            if self.config.big_model is None or self.config.big_model.strip() == "":
-                logger.info(f"No big_model configured for unknown model type, using client model: {claude_model}")
-                return claude_model
-            return self.config.big_model
+        return configured_model
 
 model_manager = ModelManager(config)
\ No newline at end of file
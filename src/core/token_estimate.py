@@ -0,0 +1,37 @@
+import hashlib
+from typing import Dict, Tuple
+
+# Rough estimation: 4 characters per token
+CHARS_PER_TOKEN: int = 4
+
+# 缓存16字节摘要到估算值的映射，不保留请求文本本身，
+# 上限4096条时驻留内存不过百余KB
+_CACHE_SIZE: int = 4096
+_estimate_cache: Dict[bytes, int] = {}
+
+
+def estimate_tokens(texts: Tuple[str, ...]) -> int:
+    """Estimate the token count for a tuple of text fragments.
+
+    Agent/tool loops re-submit near-identical message histories on every
+    turn, so the same content is counted over and over; memoizing on a
+    blake2b digest of the content turns those repeats into a single
+    cache lookup without pinning the texts themselves in memory.
+
+    纯函数、严格类型标注、不依赖任何框架类型，可直接用mypyc/Cython编译。
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for text in texts:
+        hasher.update(text.encode("utf-8"))
+        hasher.update(b"\0")
+    key = hasher.digest()
+
+    cached = _estimate_cache.get(key)
+    if cached is not None:
+        return cached
+
+    estimate = max(1, sum(map(len, texts)) // CHARS_PER_TOKEN)
+    if len(_estimate_cache) >= _CACHE_SIZE:
+        _estimate_cache.clear()
+    _estimate_cache[key] = estimate
+    return estimate
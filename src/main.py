@@ -4,7 +4,18 @@ import uvicorn
 import sys
 from src.core.config import config
 
-app = FastAPI(title="Claude-to-OpenAI API Proxy", version="1.0.0")
+# orjson序列化比标准库json快2-5倍，未安装时回退到默认的JSONResponse
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as _default_response_class
+except ImportError:
+    from fastapi.responses import JSONResponse as _default_response_class
+
+app = FastAPI(
+    title="Claude-to-OpenAI API Proxy",
+    version="1.0.0",
+    default_response_class=_default_response_class,
+)
 
 app.include_router(api_router)
 
@@ -77,18 +88,33 @@ def main():
 
     # Parse log level - extract just the first word to handle comments
     log_level = config.log_level.split()[0].lower()
-    
+
     # Validate and set default if invalid
     valid_levels = ['debug', 'info', 'warning', 'error', 'critical']
     if log_level not in valid_levels:
         log_level = 'info'
 
+    # uvloop+httptools把事件循环和HTTP解析下沉到C实现，代理类I/O负载吞吐约翻倍；
+    # 未安装时回退到标准库asyncio/h11
+    try:
+        import uvloop  # noqa: F401
+        loop_impl = "uvloop"
+    except ImportError:
+        loop_impl = "asyncio"
+    try:
+        import httptools  # noqa: F401
+        http_impl = "httptools"
+    except ImportError:
+        http_impl = "h11"
+
     # Start server
     uvicorn.run(
         "src.main:app",
         host=config.host,
         port=config.port,
         log_level=log_level,
+        loop=loop_impl,
+        http=http_impl,
         reload=False,
     )
 